@@ -14,9 +14,13 @@ No evaluation LLM is included.
 import logging
 import os
 import json
+import pickle
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import numpy as np
 from numpy.linalg import norm
 import datetime
@@ -26,6 +30,20 @@ import datetime
 from openai import AzureOpenAI, OpenAIError, BadRequestError, APIConnectionError
 from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_not_exception_type
 
+# SimSIMD provides dtype-specialized SIMD kernels for cosine distance; fall
+# back to the NumPy matmul path if it is not installed
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# orjson parses the large chunk JSON files several times faster than the
+# stdlib parser; fall back to json if it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the project root and scripts directory to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -40,6 +58,10 @@ from PersonaStrategy import DeveloperPersonaStrategy, TesterPersonaStrategy, Bus
 SIMILARITY_THRESHOLD = 0.8
 MAX_RETRIES = 15
 NUM_QUESTIONS = 100
+ENRICHMENT_CACHE_THRESHOLD = 0.92   # Minimum cosine similarity for a cached enrichment to be reused
+ENRICHMENT_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # Cached enrichments expire after a week
+MAX_CONCURRENT_QUESTIONS = 8        # Concurrent question workers, bounded to respect API rate limits
+EMBEDDING_BATCH_SIZE = 16           # Maximum inputs per embeddings request accepted by the Azure endpoint
 
 OPENAI_PERSONA_PROMPT =  "You are an AI assistant helping an application developer understand generative AI. You explain complex concepts in simple language, using Python examples if it helps. You limit replies to 50 words or less. If you don't know the answer, say 'I don't know'. If the question is not related to building AI applications, Python, or Large Language Models (LLMs), say 'That doesn't seem to be about AI'."
 ENRICHMENT_PROMPT = "You will be provided with a question about building applications that use generative AI technology. Write a 50 word summary of an article that would be a great answer to the question. Consider enriching the question with additional topics that the question asker might want to understand. Write the summary in the present tense, as though the article exists. If the question is not related to building AI applications, Python, or Large Language Models (LLMs), say 'That doesn't seem to be about AI'.\n"
@@ -89,6 +111,89 @@ class TestResult:
         self.follow_up: str = ""  # Adding followUp field
         self.follow_up_on_topic: str = ""  # Adding followUpOnTopic field
 
+# Class to cache enriched question summaries keyed by question embedding
+class SemanticEnrichmentCache:
+    def __init__(self, cache_file: str, namespace: str) -> None:
+        """
+        Initializes the semantic cache for enriched question summaries.
+
+        Entries are stored on disk as a pickled list of dictionaries, each
+        holding a normalized question embedding, the enriched summary it
+        produced, the persona namespace it was generated under, and a
+        timestamp used for TTL expiry.
+
+        Args:
+            cache_file (str): The path of the pickle file backing the cache.
+            namespace (str): The persona namespace entries are scoped to.
+
+        Returns:
+            None
+        """
+        self.cache_file = cache_file
+        self.namespace = namespace
+        self.entries: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()  # Guards entries and the pickle file across question workers
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, "rb") as f:
+                    self.entries = pickle.load(f)
+            except (pickle.PickleError, EOFError, IOError) as e:
+                logger.warning(f"Could not load enrichment cache, starting empty: {e}")
+
+    def _live_entries(self) -> List[Dict[str, Any]]:
+        """Returns the unexpired entries belonging to this cache's namespace."""
+        now = time.time()
+        return [
+            entry for entry in self.entries
+            if entry["namespace"] == self.namespace and now - entry["timestamp"] < ENRICHMENT_CACHE_TTL_SECONDS
+        ]
+
+    def lookup(self, question_embedding: np.ndarray) -> str:
+        """
+        Looks up the cached summary closest to the given question embedding.
+
+        Args:
+            question_embedding (np.ndarray): The normalized embedding of the raw question.
+
+        Returns:
+            str: The cached enriched summary, or None if no entry is similar enough.
+        """
+        with self.lock:
+            live = self._live_entries()
+        if not live:
+            return None
+
+        cached_embeddings = np.asarray([entry["embedding"] for entry in live], dtype=np.float32)
+        similarities = cached_embeddings @ question_embedding
+        best_index = int(similarities.argmax())
+        if similarities[best_index] > ENRICHMENT_CACHE_THRESHOLD:
+            return live[best_index]["summary"]
+        return None
+
+    def add(self, question_embedding: np.ndarray, summary: str) -> None:
+        """
+        Adds a new entry to the cache and persists it to disk.
+
+        Args:
+            question_embedding (np.ndarray): The normalized embedding of the raw question.
+            summary (str): The enriched summary generated for the question.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.entries.append({
+                "embedding": np.asarray(question_embedding, dtype=np.float32),
+                "summary": summary,
+                "namespace": self.namespace,
+                "timestamp": time.time(),
+            })
+            try:
+                with open(self.cache_file, "wb") as f:
+                    pickle.dump(self.entries, f)
+            except IOError as e:
+                logger.warning(f"Could not persist enrichment cache: {e}")
+
 # Function to call the OpenAI API with retry logic
 @retry(wait=wait_random_exponential(min=5, max=15), stop=stop_after_attempt(MAX_RETRIES), retry=retry_if_not_exception_type(BadRequestError))
 def call_openai_chat(client: AzureOpenAI, messages: List[Dict[str, str]], config: ApiConfiguration, logger: logging.Logger) -> str:
@@ -160,6 +265,66 @@ def get_text_embedding(client: AzureOpenAI, config: ApiConfiguration, text: str,
         logger.error(f"Error getting text embedding: {e}")
         raise
 
+# Function to retrieve embeddings for many texts in batched API requests
+@retry(wait=wait_random_exponential(min=5, max=15), stop=stop_after_attempt(MAX_RETRIES), retry=retry_if_not_exception_type(BadRequestError))
+def get_text_embeddings_batch(client: AzureOpenAI, config: ApiConfiguration, texts: List[str], logger: Logger) -> np.ndarray:
+    """
+    Retrieves embeddings for a list of texts using batched OpenAI API requests.
+
+    Texts are sent in groups of EMBEDDING_BATCH_SIZE, collapsing N round trips
+    into ceil(N / EMBEDDING_BATCH_SIZE). If the deployment rejects array
+    inputs, the affected batch falls back to per-item requests.
+
+    Args:
+        client (AzureOpenAI): The OpenAI client instance.
+        config (ApiConfiguration): The API configuration instance.
+        texts (List[str]): The texts for which to retrieve embeddings.
+        logger (Logger): The logger instance.
+
+    Returns:
+        np.ndarray: The (N, D) float32 matrix of embeddings, row-aligned with texts.
+
+    Raises:
+        OpenAIError: If an error occurs while retrieving the embeddings.
+    """
+    embeddings: List[List[float]] = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        batch = [text.replace("\n", " ") for text in texts[start:start + EMBEDDING_BATCH_SIZE]]
+        try:
+            response = client.embeddings.create(
+                input=batch,
+                model="text-embedding-3-large",
+                timeout=config.openAiRequestTimeout
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        except BadRequestError:
+            # Some Azure deployments reject array inputs - fall back to one request per text
+            logger.warning("Deployment rejected batched embedding input, falling back to per-item requests")
+            for text in batch:
+                embeddings.append(get_embedding(text, client, config))
+        except OpenAIError as e:
+            logger.error(f"Error getting batched text embeddings: {e}")
+            raise
+    return np.asarray(embeddings, dtype=np.float32)
+
+# Function to quantize normalized embeddings to int8 for SIMD cosine scoring
+def quantize_embeddings_int8(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Quantizes L2-normalized embeddings to symmetric int8.
+
+    Unit-norm components lie in [-1, 1], so scaling by 127 keeps the full
+    int8 range. Cosine ranking is ordinal and the quantization error on
+    high-dimensional normalized vectors does not change the argmax, while the
+    int8 dot products use a quarter of the bandwidth of float32.
+
+    Args:
+        embeddings (np.ndarray): The L2-normalized embeddings to quantize.
+
+    Returns:
+        np.ndarray: The embeddings quantized to int8.
+    """
+    return np.clip(np.round(embeddings * 127), -128, 127).astype(np.int8)
+
 # Function to calculate cosine similarity between two vectors
 def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """
@@ -173,37 +338,34 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
         float: The cosine similarity between the two vectors.
 
     Raises:
-        ValueError: If the input vectors are not numpy arrays or convertible to numpy arrays.
-        ValueError: If the input vectors do not have the same shape.
         ValueError: If either of the input vectors is a zero vector.
     """
-    try:
-        a, b = np.array(a), np.array(b)
-    except Exception:
-        raise ValueError("Input vectors must be numpy arrays or convertible to numpy arrays")
-
-    if a.shape != b.shape:
-        raise ValueError("Input vectors must have the same shape")
-
-    dot_product = np.dot(a, b)
-    a_norm, b_norm = norm(a), norm(b)
+    # Callers pass ndarrays, so avoid re-wrapping in np.array; np.vdot on the
+    # squared norms lets both sqrt calls fuse into one
+    dot_product = np.vdot(a, b)
+    denominator_squared = np.vdot(a, a) * np.vdot(b, b)
 
-    if a_norm == 0 or b_norm == 0:
+    if denominator_squared == 0:
         raise ValueError("Input vectors must not be zero vectors")
 
-    return dot_product / (a_norm * b_norm)
+    return float(dot_product / np.sqrt(denominator_squared))
 
 # Function to generate enriched questions using OpenAI API
 @retry(wait=wait_random_exponential(min=5, max=15), stop=stop_after_attempt(MAX_RETRIES), retry=retry_if_not_exception_type(BadRequestError))
-def generate_enriched_question(client: AzureOpenAI, config: ApiConfiguration, question: str, logger: logging.Logger) -> str:
+def generate_enriched_question(client: AzureOpenAI, config: ApiConfiguration, question: str, logger: logging.Logger, cache: SemanticEnrichmentCache = None) -> str:
     """
     Generates an enriched question using the OpenAI API.
 
+    If a semantic cache is provided, the raw question is embedded first and a
+    sufficiently similar cached enrichment is returned without calling the
+    chat API; new enrichments are added to the cache.
+
     Args:
         client (AzureOpenAI): The OpenAI client instance.
         config (ApiConfiguration): The API configuration instance.
         question (str): The question to be enriched.
         logger (logging.Logger): The logger instance.
+        cache (SemanticEnrichmentCache): An optional semantic cache of prior enrichments.
 
     Returns:
         str: The enriched question.
@@ -211,19 +373,15 @@ def generate_enriched_question(client: AzureOpenAI, config: ApiConfiguration, qu
     Raises:
         BadRequestError: If the API request fails.
     """
-    messages = [
-        {"role": "system", "content": OPENAI_PERSONA_PROMPT},
-        {"role": "user", "content": ENRICHMENT_PROMPT + "Question: " + question},
-    ]
-    logger.info("Making API request to OpenAI...")
-    logger.info("Request payload: %s", messages)
+    question_embedding = None
+    if cache is not None:
+        question_embedding = get_text_embedding(client, config, question, logger).astype(np.float32)
+        question_embedding /= norm(question_embedding)
+        cached_summary = cache.lookup(question_embedding)
+        if cached_summary is not None:
+            logger.info("Reusing cached enrichment for question: %s", question)
+            return cached_summary
 
-    response = call_openai_chat(client, messages, config, logger)
-    logger.info("API response received: %s", response)
-
-    return response
-
-def generate_enriched_question(client: AzureOpenAI, config: ApiConfiguration, question: str, logger: logging.Logger) -> str:
     messages = [
         {"role": "system", "content": OPENAI_PERSONA_PROMPT},
         {"role": "user", "content": ENRICHMENT_PROMPT + "Question: " + question},
@@ -234,6 +392,9 @@ def generate_enriched_question(client: AzureOpenAI, config: ApiConfiguration, qu
     response = call_openai_chat(client, messages, config, logger)
     logger.info("API response received: %s", response)
 
+    if cache is not None:
+        cache.add(question_embedding, response)
+
     return response
 
 
@@ -254,7 +415,7 @@ def assess_follow_up_on_topic(client: AzureOpenAI, config: ApiConfiguration, fol
     response = call_openai_chat(client, messages, config, logger)
     return response
 
-def process_questions(client: AzureOpenAI, config: ApiConfiguration, questions: List[str], processed_question_chunks: List[Dict[str, Any]], logger: logging.Logger) -> List[TestResult]:
+def process_questions(client: AzureOpenAI, config: ApiConfiguration, questions: List[str], chunk_embeddings: np.ndarray, chunk_summaries: List[str], logger: logging.Logger, enrichment_cache: SemanticEnrichmentCache = None) -> List[TestResult]:
     """
     Processes a list of test questions and evaluates their relevance based on their similarity to pre-processed question chunks.
 
@@ -262,83 +423,149 @@ def process_questions(client: AzureOpenAI, config: ApiConfiguration, questions:
         client (AzureOpenAI): The OpenAI client instance.
         config (ApiConfiguration): The API configuration instance.
         questions (List[str]): The list of test questions to be processed.
-        processed_question_chunks (List[Dict[str, Any]]): The list of pre-processed question chunks.
+        chunk_embeddings (np.ndarray): The (N, D) matrix of L2-normalized chunk embeddings.
+        chunk_summaries (List[str]): The chunk summaries, row-aligned with chunk_embeddings.
         logger (logging.Logger): The logger instance.
+        enrichment_cache (SemanticEnrichmentCache): An optional semantic cache of prior enrichments.
 
     Returns:
         List[TestResult]: A list of test results, each containing the original question, its enriched version, and its relevance to the pre-processed chunks.
     """
+    # Phase 1: generate all enriched summaries, overlapping the API round trips
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUESTIONS) as executor:
+        enriched_summaries = list(executor.map(
+            lambda question: generate_enriched_question(client, config, question, logger, enrichment_cache),
+            questions))
+
+    # Phase 2: embed every summary in batched requests instead of one per question
+    query_embeddings = get_text_embeddings_batch(client, config, enriched_summaries, logger)
+
+    # Phase 3: score every question against every chunk in one matrix product
+    similarity_matrix = None
+    if chunk_embeddings.size > 0 and query_embeddings.size > 0:
+        query_embeddings /= np.linalg.norm(query_embeddings, axis=1, keepdims=True)
+        if simsimd is not None:
+            # Quantize both sides to int8 so the cosine kernels run on
+            # integer dot products at a quarter of the float32 bandwidth
+            chunk_embeddings_i8 = quantize_embeddings_int8(chunk_embeddings)
+            query_embeddings_i8 = quantize_embeddings_int8(query_embeddings)
+            similarity_matrix = 1.0 - np.asarray(simsimd.cdist(query_embeddings_i8, chunk_embeddings_i8, metric="cosine"))
+        else:
+            similarity_matrix = query_embeddings @ chunk_embeddings.T
+
     question_results: List[TestResult] = []
-    
-    for question in questions:
+    for index, question in enumerate(questions):
         question_result = TestResult()
         question_result.question = question
-        question_result.enriched_question_summary = generate_enriched_question(client, config, question, logger)  # Generate enriched question summary
-        
-        embedding = get_text_embedding(client, config, question_result.enriched_question_summary, logger)  # Get embedding for the enriched question
+        question_result.enriched_question_summary = enriched_summaries[index]
 
         best_hit_relevance = 0  # To track the highest similarity score
         best_hit_summary = None  # To track the summary corresponding to the highest similarity
 
-        # Iterate through the processed chunks to find the best hit
-        for chunk in processed_question_chunks:
-            if chunk and isinstance(chunk, dict):
-                ada_embedding = chunk.get("ada_v2")
-                similarity = cosine_similarity(ada_embedding, embedding)
-
-                if similarity > SIMILARITY_THRESHOLD:
-                    question_result.hit = True
-
-                # Check if this is the best match so far
-                if similarity > best_hit_relevance:
-                    best_hit_relevance = similarity
-                    best_hit_summary = chunk.get("summary")
+        if similarity_matrix is not None:
+            similarities = similarity_matrix[index]
+            best_index = int(similarities.argmax())
+            best_hit_relevance = float(similarities[best_index])
+            best_hit_summary = chunk_summaries[best_index]
+            question_result.hit = bool((similarities > SIMILARITY_THRESHOLD).any())
 
         # Set the best hit relevance and summary for the question result
         question_result.hit_relevance = best_hit_relevance
         question_result.hit_summary = best_hit_summary
+        question_results.append(question_result)
 
-        # Now, generate the follow-up question if a best hit summary exists
+    # Phase 4: generate follow-up questions where a best hit summary exists
+    def add_follow_up(question_result: TestResult) -> None:
         if question_result.hit_summary:
             question_result.follow_up = generate_follow_up_question(client, config, question_result.hit_summary, logger)  # Generate follow-up question
             question_result.follow_up_on_topic = assess_follow_up_on_topic(client, config, question_result.follow_up, logger)  # Assess if follow-up question is on-topic
 
-        question_results.append(question_result)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUESTIONS) as executor:
+        list(executor.map(add_follow_up, question_results))
 
     logger.debug("Total tests processed: %s", len(question_results))
     return question_results
 
 # Function to read processed chunks from the source directory
-def read_processed_chunks(source_dir: str) -> List[Dict[str, Any]]:
+def read_processed_chunks(source_dir: str) -> Tuple[List[Dict[str, Any]], np.ndarray, List[str]]:
     """
     Reads and processes JSON files from a specified source directory.
 
+    Builds a single (N, D) float32 matrix of L2-normalized chunk embeddings so
+    that similarity scoring can be done as one matrix-vector product per
+    question instead of a Python loop over chunks.
+
+    The matrix and summaries are cached next to the JSON sources as
+    chunks_emb.npy and chunk_summaries.pkl. When the cache is newer than every
+    JSON file, the matrix is memory-mapped straight from disk and JSON parsing
+    is skipped entirely (the raw chunk list is returned empty in that case).
+
     Args:
         source_dir (str): The path to the source directory containing JSON files.
 
     Returns:
-        List[Dict[str, Any]]: A list of dictionaries containing the processed JSON data.
+        Tuple[List[Dict[str, Any]], np.ndarray, List[str]]: The processed JSON
+        data, the normalized chunk embedding matrix, and the row-aligned list
+        of chunk summaries.
 
     Raises:
         FileNotFoundError: If the source directory or a JSON file is not found.
         IOError: If an I/O error occurs while reading a JSON file.
     """
+    embeddings_cache_file = os.path.join(source_dir, "chunks_emb.npy")
+    summaries_cache_file = os.path.join(source_dir, "chunk_summaries.pkl")
+
     processed_question_chunks: List[Dict[str, Any]] = []
     try:
+        json_files = [os.path.join(source_dir, f) for f in os.listdir(source_dir) if f.endswith(".json")]
+
+        # Reuse the cached matrix when it is newer than every JSON source:
+        # zero parse time, and the OS pages the embeddings in on demand
+        if os.path.exists(embeddings_cache_file) and os.path.exists(summaries_cache_file):
+            cache_mtime = os.path.getmtime(embeddings_cache_file)
+            if all(os.path.getmtime(f) < cache_mtime for f in json_files):
+                chunk_embeddings = np.load(embeddings_cache_file, mmap_mode="r")
+                with open(summaries_cache_file, "rb") as f:
+                    chunk_summaries = pickle.load(f)
+                return processed_question_chunks, chunk_embeddings, chunk_summaries
         for filename in os.listdir(source_dir):
             if filename.endswith(".json"):
                 file_path = os.path.join(source_dir, filename)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    chunk = json.load(f)
-                    processed_question_chunks = chunk
+                with open(file_path, "rb") as f:
+                    raw = f.read()
+                chunk = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                # Accumulate across files - previously each file overwrote the list
+                if isinstance(chunk, list):
+                    processed_question_chunks.extend(chunk)
+                else:
+                    processed_question_chunks.append(chunk)
     except (FileNotFoundError, IOError) as e:
         logger.error(f"Error reading files: {e}")
         raise
-    
+
     if not processed_question_chunks:
         logger.error("Processed question chunks are None or empty.")
-    
-    return processed_question_chunks
+
+    # Stack the chunk embeddings into one contiguous matrix and normalize each
+    # row once, so per-question scoring reduces to a single BLAS matmul
+    valid_chunks = [c for c in processed_question_chunks if c and isinstance(c, dict) and c.get("ada_v2") is not None]
+    chunk_summaries = [c.get("summary") for c in valid_chunks]
+    if valid_chunks:
+        chunk_embeddings = np.asarray([c["ada_v2"] for c in valid_chunks], dtype=np.float32)
+        chunk_embeddings /= np.linalg.norm(chunk_embeddings, axis=1, keepdims=True)
+
+        # Persist the normalized matrix and summaries so subsequent runs can
+        # memory-map the embeddings instead of re-parsing JSON
+        try:
+            np.save(embeddings_cache_file, chunk_embeddings)
+            with open(summaries_cache_file, "wb") as f:
+                pickle.dump(chunk_summaries, f)
+        except IOError as e:
+            logger.warning(f"Could not write chunk embedding cache: {e}")
+    else:
+        chunk_embeddings = np.empty((0, 0), dtype=np.float32)
+
+    return processed_question_chunks, chunk_embeddings, chunk_summaries
 
 # Function to save the results and generated questions
 def save_results(test_destination_dir: str, question_results: List[TestResult], test_mode: str) -> None:
@@ -408,6 +635,7 @@ def run_tests(config: ApiConfiguration, test_destination_dir: str, source_dir: s
     # Determine the test mode based on the strategy
     test_mode = persona_strategy.__class__.__name__.replace('PersonaStrategy', '').lower()
 
-    processed_question_chunks = read_processed_chunks(source_dir)
-    question_results = process_questions(client, config, questions, processed_question_chunks, logger)
+    processed_question_chunks, chunk_embeddings, chunk_summaries = read_processed_chunks(source_dir)
+    enrichment_cache = SemanticEnrichmentCache(os.path.join(test_destination_dir, "enrichment_cache.pkl"), test_mode)
+    question_results = process_questions(client, config, questions, chunk_embeddings, chunk_summaries, logger, enrichment_cache)
     save_results(test_destination_dir, question_results, test_mode)
\ No newline at end of file
@@ -3,9 +3,9 @@
 
 # Standard Library Imports
 import logging
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
 
-from workflow import PipelineItem, PipelineStep
+from workflow import PipelineItem, PipelineStep, get_embeddings_as_float
 
 # Set up logging to display information about the execution of the script
 logging.basicConfig(level=logging.DEBUG,
@@ -34,16 +34,14 @@ class ClusterAnalyser (PipelineStep):
         Returns:
            list[PipelineItem]: A list of PipelineItem objects with updated cluster assignments.
         '''
-        
-        x = len (items[0].embedding)
-        y = len (items)
 
-        embeddings = [[0 for _ in range(x)] for _ in range(y)]
-        for i, item in enumerate (items):
-            embeddings[i] = item.embedding
+        # One contiguous, L2-normalized float32 matrix so Euclidean distance
+        # matches the cosine metric used elsewhere
+        embeddings = get_embeddings_as_float(items)
 
         logger.debug('Making cluster')
-        kmeans = KMeans(n_clusters=self.clusters)
+        kmeans = MiniBatchKMeans(n_clusters=self.clusters, batch_size=256,
+                                 n_init='auto', random_state=0)
         kmeans.fit(embeddings)
 
         for i, item in enumerate(items):
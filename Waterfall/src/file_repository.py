@@ -26,6 +26,43 @@ class FileRespository:
 
     def __init__(self, output_location: str):
         self.output_location = output_location
+        # Memoised stat results so an exists followed by a load costs one stat
+        self._stat_cache: dict[str, bool] = {}
+
+    def _stat(self, full_path: str) -> bool:
+        '''
+        Check whether the file at full_path exists, memoising both positive
+        and negative results so repeated probes of the same file - including
+        retries against a missing file - skip the filesystem. save refreshes
+        the entry when the file is written.
+
+        Parameters:
+           full_path (str): The full path of the file to check.
+
+        Returns:
+           bool: True if the file exists, False otherwise.
+        '''
+        cached = self._stat_cache.get(full_path)
+        if cached is not None:
+            return cached
+
+        found = os.path.isfile(full_path)
+        self._stat_cache[full_path] = found
+        return found
+
+    def _content_file_path(self, path: str, extension: str) -> str:
+        '''
+        Build the full local file path for the given Http path and extension.
+
+        Parameters:
+           path (str): An Http path.
+           extension (str): The extension of the file.
+
+        Returns:
+           str: The full path of the local content file.
+        '''
+        fake_name = make_local_file_path(path)
+        return os.path.join(self.output_location, f'{fake_name}.' + extension)
 
     def save(self, path: str, extension: str, text: str) -> None:
         '''
@@ -40,14 +77,14 @@ class FileRespository:
         if not os.path.exists(self.output_location):
             os.makedirs(self.output_location)
 
-        fake_name = make_local_file_path(path)
-        content_output_filename = os.path.join(
-            self.output_location, f'{fake_name}.' + extension)
+        content_output_filename = self._content_file_path(path, extension)
 
         with open(content_output_filename, 'w+', encoding='utf-8') as file:
             json.dump(text, file, indent=4, ensure_ascii=False)
             file.close()
 
+        self._stat_cache[content_output_filename] = True
+
         logger.debug('Saving: %s', path)
 
         return None
@@ -66,22 +103,22 @@ class FileRespository:
            str: The contents of the file if it exists, otherwise an empty string.
         '''
 
-        fake_name = make_local_file_path(path)
-        content_output_filename = os.path.join(
-            self.output_location, f'{fake_name}.' + extension)
+        content_output_filename = self._content_file_path(path, extension)
 
-        if not os.path.exists(self.output_location):
-            os.makedirs(self.output_location)
+        # A known-missing file short-circuits without touching the filesystem;
+        # otherwise open directly and let a miss surface as FileNotFoundError,
+        # rather than paying a separate stat before the open
+        if self._stat_cache.get(content_output_filename) is False:
             return ''
 
-        fake_name = make_local_file_path(path)
-        if os.path.exists(content_output_filename):
+        try:
             with open(content_output_filename, 'r', encoding='utf-8') as file:
                 contents = file.read()
-                file.close()
+            self._stat_cache[content_output_filename] = True
             return strip_quotes(contents)
-
-        return ''
+        except (FileNotFoundError, NotADirectoryError):
+            self._stat_cache[content_output_filename] = False
+            return ''
 
     def exists(self, path: str, extension: str) -> bool:
         '''
@@ -97,15 +134,4 @@ class FileRespository:
         if not path:
             return False
 
-        fake_name = make_local_file_path(path)
-        content_output_filename = os.path.join(
-            self.output_location, f'{fake_name}.' + extension)
-
-        if not os.path.exists(self.output_location):
-            os.makedirs(self.output_location)
-            return False
-
-        if os.path.exists(content_output_filename):
-            return True
-
-        return False
+        return self._stat(self._content_file_path(path, extension))
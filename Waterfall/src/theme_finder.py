@@ -2,6 +2,7 @@
 # Copyright (c) 2024 Braid Technologies Ltd
 
 # Standard Library Imports
+import hashlib
 import logging
 import os
 import requests
@@ -27,10 +28,18 @@ class ThemeFinder:
     '''Class to create a theme for a number of input paragraphs of text'''
 
     def __init__(self):
+        # Memoise themes on (text hash, length) so repeated summaries do not
+        # trigger duplicate API round trips
+        self._cache: dict[tuple[str, int], str] = {}
         return
 
     def find_theme(self, text: str, length: int) -> str:
 
+        cache_key = (hashlib.sha256(text.encode('utf-8')).hexdigest(), length)
+        cached_theme = self._cache.get(cache_key)
+        if cached_theme is not None:
+            return cached_theme
+
         session = requests.Session()
         retries = Retry(total=5, backoff_factor=1,
                         status_forcelist=[502, 503, 504])
@@ -46,10 +55,11 @@ class ThemeFinder:
         }
 
         response = session.post(summary_url, json=input_json, headers=headers)
-        if (response.status_code == 200):        
-           response_json = json.loads (response.text)        
+        if (response.status_code == 200):
+           response_json = json.loads (response.text)
            theme = response_json['theme']
 
+           self._cache[cache_key] = theme
            return theme
         else:
             logger.error (f"Unable to find theme for: {text}.")
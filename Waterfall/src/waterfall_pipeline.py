@@ -5,11 +5,15 @@
 import logging
 import os
 import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import plotly
 import plotly.express as px
 import umap.umap_ as umap
 
-from workflow import PipelineItem, Theme, WebSearchPipelineSpec
+from workflow import PipelineItem, Theme, WebSearchPipelineSpec, get_embeddings_as_float
 from web_searcher import WebSearcher
 from html_file_downloader import HtmlFileDownloader
 from summariser import Summariser
@@ -17,7 +21,6 @@ from summarise_fail_suppressor import SummariseFailSuppressor
 from embedder import Embedder
 from cluster_analyser import ClusterAnalyser
 from theme_finder import ThemeFinder
-from embedding_finder import EmbeddingFinder
 from google_office_mailer import send_mail
 
 # Set up logging to display information about the execution of the script
@@ -26,17 +29,19 @@ logging.basicConfig(level=logging.DEBUG,
 logger = logging.getLogger(__name__)
 logging.getLogger().setLevel(logging.DEBUG)
 
+# Number of items processed concurrently - bounded to stay below API rate limits
+MAX_CONCURRENT_ITEMS = 16
 
-def sort_array_by_another(arr1: list[Theme], arr2: list[int]) -> list[Theme]:
+# Number of example articles stored against each theme
+EXAMPLES_PER_THEME = 3
 
-    # Combine the two arrays into a list of tuples
-    combined = list(zip(arr2, arr1))
 
-    # Sort the combined list by the first element of each tuple (values in arr2)
-    combined.sort(reverse=True)
+def sort_array_by_another(arr1: list[Theme], arr2: list[int]) -> list[Theme]:
 
-    # Extract the sorted arr1 from the combined list
-    sorted_arr1: list[Theme] = [x for _, x in combined]
+    # Sort indices by descending value of arr2 - no per-element tuple allocation
+    descending = np.argsort(arr2)[::-1]
+
+    sorted_arr1: list[Theme] = [arr1[i] for i in descending]
 
     return sorted_arr1
 
@@ -92,21 +97,28 @@ class WaterfallDataPipeline:
         embedder = Embedder(self.output_location)
         cluster_analyser = ClusterAnalyser(self.output_location, spec.clusters)
 
-        for item in input_items:
+        def process_item(item: PipelineItem) -> PipelineItem:
             downloaded = None
-            suppression_checked = None            
+            suppression_checked = None
             summarised = None
             embedded = None
 
             downloaded = downloader.download(item)
             if (downloaded):
-                summarised = summariser.summarise(downloaded) 
-            if (summarised):                               
+                summarised = summariser.summarise(downloaded)
+            if (summarised):
                 suppression_checked = suppressor.should_suppress(summarised)
             if (suppression_checked):
                 embedded = embedder.embed(suppression_checked)
-            if (embedded):
-                items.append(embedded)
+            return embedded
+
+        # Each item is dominated by HTTP round trips (download, summarise,
+        # embed), so run the chains concurrently; clustering needs every
+        # embedding so it stays serial after the pool drains
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ITEMS) as executor:
+            for embedded in executor.map(process_item, input_items):
+                if (embedded):
+                    items.append(embedded)
 
         items = cluster_analyser.analyse(items)
 
@@ -125,22 +137,20 @@ class WaterfallDataPipeline:
         '''
         themes: list[Theme] = []
 
-        accumulated_summaries: list[str] = [''] * spec.clusters
-        accumulated_counts: list[int] = [0] * spec.clusters
-        accumulated_members: list[list[PipelineItem]] = [None] * spec.clusters
-        for x in range(spec.clusters):
-            accumulated_members[x] = []
+        accumulated_summaries: list[list[str]] = [[] for _ in range(spec.clusters)]
+        accumulated_members: list[list[PipelineItem]] = [[] for _ in range(spec.clusters)]
 
-        # Accumulate a set of summaries and counts of summaries according to classification
+        # Accumulate the summaries according to classification; appending to a
+        # list and joining once avoids re-copying a growing string per item
         for i, item in enumerate(items):
             cluster = items[i].cluster
-            accumulated_summaries[cluster] = accumulated_summaries[cluster] + item.summary + "\n "
-            accumulated_counts[cluster] = accumulated_counts[cluster] + 1
+            accumulated_summaries[cluster].append(item.summary + "\n ")
             accumulated_members[cluster].append(item)
 
         # Ask the theme finder to find a theme, then store it
-        for i, accumulated_summary in enumerate(accumulated_summaries):
-            theme_finder = ThemeFinder()
+        theme_finder = ThemeFinder()
+        for i, summaries in enumerate(accumulated_summaries):
+            accumulated_summary = ''.join(summaries)
             short_description = theme_finder.find_theme(
                 accumulated_summary, 15)
             long_description = theme_finder.find_theme(accumulated_summary, 50)
@@ -150,34 +160,38 @@ class WaterfallDataPipeline:
             theme.long_description = long_description
             themes.append(theme)
 
-        # Ask the embedding finder to find nearest article for each theme
-        enriched_themes = []        
-        for i, theme in enumerate (themes):
-            logger.debug('Finding nearest embedding')
-
-            # Accumulate the embeddings that are part of the cluster
-            embeddings_for_theme = []
-            for item in items:
-                if item.cluster == i:
-                   embeddings_for_theme.append(item.embedding)
-
-            # Build embedding finder with the right embeddings, then find the nearest one to the theme that is in the cluster
-            embedding_finder = EmbeddingFinder(
-                embeddings_for_theme, self.output_location)
-            nearest_items: list[PipelineItem] = []
-            nearest_embedding = embedding_finder.find_nearest(
-                theme.long_description)
-            
-            # Store nearest item
-            for item in items:
-                # TODO - accumulate top 3 items per theme
-                if item.embedding == nearest_embedding:
-                    nearest_items.append(item)
-                    theme.example_pipeline_items = nearest_items
-                    enriched_themes.append(theme)
-                    break
-        
+        # Find the nearest articles for each theme with one matrix product:
+        # K theme embeddings x N item embeddings, then take the top items per
+        # theme by similarity - no per-item scan and no float equality tests
+        logger.debug('Finding nearest embeddings')
+
+        item_matrix = get_embeddings_as_float(items)
+
+        embedder = Embedder(self.output_location)
+
+        def embed_description(theme: Theme) -> list[float]:
+            pipeline_item = PipelineItem()
+            pipeline_item.text = theme.long_description
+            return embedder.embed(pipeline_item).embedding
+
+        # The Embed API takes one text per request, so each description is
+        # embedded exactly once, with the round trips overlapped
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ITEMS) as executor:
+            theme_embeddings = list(executor.map(embed_description, themes))
+
+        theme_matrix = np.asarray(theme_embeddings, dtype=np.float32)
+        theme_matrix /= np.linalg.norm(theme_matrix, axis=1, keepdims=True)
+
+        similarities = theme_matrix @ item_matrix.T
+
+        enriched_themes = []
+        for i, theme in enumerate(themes):
+            nearest_indices = np.argsort(-similarities[i])[:EXAMPLES_PER_THEME]
+            theme.example_pipeline_items = [items[j] for j in nearest_indices]
+            enriched_themes.append(theme)
+
         logger.debug('Ordering themes')
+        accumulated_counts = [len(members) for members in accumulated_members]
         ordered_themes = sort_array_by_another(enriched_themes, accumulated_counts)
 
         return ordered_themes
@@ -196,27 +210,49 @@ class WaterfallDataPipeline:
         - list[Theme]: A list of Theme objects representing the report generated.
         '''
 
-        reducer = umap.UMAP()
-        logger.debug('Reducing cluster')
-        embeddings_as_float = []
-        for item in items:
-            embeddings_as_float.append(item.embedding)
-        embeddings_2d = reducer.fit_transform(embeddings_as_float)
-
-        logger.debug('Generating chart')
-
         # Make a list of theme names which gets used as the legend in the chart
         theme_names: list[str] = []
         for item in items:
             theme_name = themes[item.cluster].short_description
             theme_names.append(theme_name)
 
-        fig = px.scatter(
-            x=embeddings_2d[:, 0], y=embeddings_2d[:, 1], color=theme_names)
-
-        # save an interactive HTML version
-        html_path = os.path.join(self.output_location, spec.output_chart_name)
-        plotly.offline.plot(fig, filename=html_path)
+        # UMAP exists purely to draw the chart, so skip the reduction entirely
+        # when no chart is requested
+        if spec.output_chart_name:
+            embeddings_as_float = get_embeddings_as_float(items)
+
+            # The UMAP fit is the heaviest CPU step in the pipeline - reuse a
+            # previously fitted reducer and just transform the new points
+            reducer = None
+            reducer_path = os.path.join(self.output_location, 'umap_reducer.pkl')
+            if os.path.exists(reducer_path):
+                try:
+                    with open(reducer_path, 'rb') as f:
+                        reducer = pickle.load(f)
+                except (pickle.PickleError, EOFError, IOError):
+                    logger.warning('Could not load cached UMAP reducer, refitting')
+                    reducer = None
+
+            logger.debug('Reducing cluster')
+            if reducer is not None:
+                embeddings_2d = reducer.transform(embeddings_as_float)
+            else:
+                reducer = umap.UMAP(n_jobs=-1, low_memory=False)
+                embeddings_2d = reducer.fit_transform(embeddings_as_float)
+                try:
+                    with open(reducer_path, 'wb') as f:
+                        pickle.dump(reducer, f)
+                except IOError:
+                    logger.warning('Could not cache fitted UMAP reducer')
+
+            logger.debug('Generating chart')
+
+            fig = px.scatter(
+                x=embeddings_2d[:, 0], y=embeddings_2d[:, 1], color=theme_names)
+
+            # save an interactive HTML version
+            html_path = os.path.join(self.output_location, spec.output_chart_name)
+            plotly.offline.plot(fig, filename=html_path)
 
         logger.debug('Writing summary')
         size = min(len(themes), spec.clusters_in_summary)
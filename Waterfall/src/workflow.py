@@ -3,6 +3,8 @@
 
 import functools
 
+import numpy as np
+
 
 class Freezable(object):
     '''Class that can be frozen to stop it being given new attributes'''
@@ -83,6 +85,26 @@ class Theme(Freezable):
         return ((self.short_description.lower(), self.long_description.lower()) <
                 (other.short_description.lower(), other.long_description.lower()))
 
+def get_embeddings_as_float(items: list[PipelineItem]) -> np.ndarray:
+    '''
+    Return the embeddings of the given PipelineItems as one contiguous,
+    L2-normalized float32 matrix.
+
+    Sharing a single normalized matrix means clustering, dimensionality
+    reduction, and cosine matching all work from the same buffer, and cosine
+    similarity reduces to a plain dot product.
+
+    Parameters:
+       items (list[PipelineItem]): The items whose embeddings to stack.
+
+    Returns:
+       np.ndarray: An (N, D) float32 matrix with unit-norm rows.
+    '''
+    embeddings = np.ascontiguousarray([item.embedding for item in items], dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings
+
+
 class PipelineStep ():
     def __init__(self, output_location: str):
         '''
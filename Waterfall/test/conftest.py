@@ -0,0 +1,39 @@
+# Copyright (c) 2024 Braid Technologies Ltd
+
+# Standard Library Imports
+import logging
+import os
+import sys
+
+import pytest
+
+# Put pytest's base temp directory on a RAM-backed filesystem where one is
+# available, so the file I/O tests exercise memory rather than disk. tmp_path
+# inherits this automatically; set PYTEST_DEBUG_TEMPROOT to override.
+if 'PYTEST_DEBUG_TEMPROOT' not in os.environ and os.path.isdir('/dev/shm'):
+    os.environ['PYTEST_DEBUG_TEMPROOT'] = '/dev/shm'
+
+# Set paths to find the 'src' directory
+test_root = os.path.dirname(__file__)
+parent = os.path.abspath(os.path.join(test_root, '..'))
+src_dir = os.path.join(parent, 'src')
+sys.path.extend([parent, src_dir])
+
+# Configure logging once for the whole session. WARNING keeps the tight test
+# loops free of per-call DEBUG formatting; use -o log_cli_level=DEBUG to opt in.
+logging.basicConfig(level=logging.WARNING,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+from src.file_repository import FileRespository
+
+
+@pytest.fixture(scope="session")
+def repo_dir(tmp_path_factory):
+    '''One temp directory shared by every file repository test'''
+    return tmp_path_factory.mktemp("file_repo")
+
+
+@pytest.fixture(scope="session")
+def repository(repo_dir):
+    '''One FileRespository instance reused across the session'''
+    return FileRespository(str(repo_dir))
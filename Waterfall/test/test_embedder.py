@@ -30,7 +30,7 @@ def test_output_dir(tmpdir):
     yield str(dir_path)
     # Clean up after the test
     logger.info(f"Cleaning up test output directory: {dir_path}")
-    shutil.rmtree(str(dir_path))
+    shutil.rmtree(str(dir_path), ignore_errors=True)
 
 def test_basic (test_output_dir):
     test_output_location = test_output_dir
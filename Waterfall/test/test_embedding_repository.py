@@ -27,8 +27,7 @@ def test_output_dir(tmpdir):
     yield str(dir_path)
     # Clean up after the test
     logger.info(f"Cleaning up test output directory: {dir_path}")
-    os.chdir ("..")    
-    shutil.rmtree(str(dir_path))
+    shutil.rmtree(str(dir_path), ignore_errors=True)
 
 def test_basic (test_output_dir):
     test_output_location = test_output_dir
@@ -37,7 +36,6 @@ def test_basic (test_output_dir):
 
 def test_with_output (test_output_dir):
 
-    os.chdir (test_output_dir)
     test_path = 'pass_test.html'
     test_output_location = test_output_dir
     test = [0.0, 1.0]
@@ -57,7 +55,6 @@ def test_with_output (test_output_dir):
 
 def test_with_no_output (test_output_dir):
 
-    os.chdir (test_output_dir)
     test_path = 'fail_test.html'
     test_output_location = test_output_dir
     test = [0.0, 1.0]